@@ -1,15 +1,21 @@
 import streamlit as st
 import matplotlib.pyplot as plt
-import squarify
 import numpy as np
 import matplotlib.font_manager as fm
-import matplotlib.patches as patches
 import pandas as pd
-from io import BytesIO
 import os
 import requests
+import shutil
 import tempfile
-from matplotlib.colors import to_rgb, to_hex
+from treemap_render import prepare_treemap, draw_treemap, decorate_figure
+from deepzoom import build_tile_pyramid, auto_max_level, pyramid_tile_count, zip_pyramid, MAX_LEVEL
+from live_feed import (FileTailSource, SocketSource, ThemeAggregator, LiveTreemap, load_mapping,
+                       LIVE_FEED_DIR, LIVE_FEED_HOSTS)
+from history_store import ThemeHistoryStore
+from matplotlib.figure import Figure
+from shared_state import SharedPool, session_memory_report
+from mosaic import render_mosaic, top_movers, split_by_sector
+from image_encoding import DPI_PRESETS, ENCODING_PRESETS, MIME_TYPES, EXTENSIONS, encode_figure
 
 # 페이지 설정
 st.set_page_config(page_title="주식 테마 트리맵 생성기", layout="wide")
@@ -54,32 +60,88 @@ def setup_font():
 
 font_prop = setup_font()
 
+# 날짜별 테마 데이터 이력 저장소 (모든 세션이 공유)
+@st.cache_resource
+def get_history_store():
+    return ThemeHistoryStore()
+
+
+history_store = get_history_store()
+
+
+# 세션 간에 공유하는 데이터셋 풀과 렌더링 결과 캐시
+# 같은 데이터를 보는 세션들은 같은 ThemeDataset 과 이미지 바이트를 참조함
+@st.cache_resource
+def get_shared_pool():
+    return SharedPool()
+
+
+shared_pool = get_shared_pool()
+
 # 엑셀 파일 업로드 (테마와 퍼센테이지 컬럼 인식)
 st.sidebar.header("엑셀 파일 업로드")
 uploaded_file = st.sidebar.file_uploader("엑셀 파일을 업로드하세요 (.xlsx)", type=["xlsx"])
-if uploaded_file is not None:
+# 지난 파일을 다시 올리는 경우가 많으므로 이력 저장은 직접 켜고 날짜를 골라야 함
+save_to_history = st.sidebar.checkbox("업로드한 데이터를 이력에 저장", False)
+history_date = st.sidebar.date_input("데이터 날짜 ('날짜' 컬럼이 없을 때)", value=None) if save_to_history else None
+# 같은 파일은 한 번만 읽음 (재실행마다 다시 읽으면 이력에서 불러온 데이터를 덮어씀)
+if uploaded_file is not None and st.session_state.get('uploaded_file_id') != uploaded_file.file_id:
     try:
         df_upload = pd.read_excel(uploaded_file)
         if "테마" in df_upload.columns and "퍼센테이지" in df_upload.columns:
+            df_upload = df_upload.dropna(subset=["테마", "퍼센테이지"])
             new_data = dict(zip(df_upload["테마"], df_upload["퍼센테이지"]))
-            st.session_state.theme_data = new_data
+            st.session_state.theme_data = shared_pool.dataset(new_data)
+            st.session_state.uploaded_file_id = uploaded_file.file_id
             st.sidebar.success("엑셀 파일의 데이터를 불러왔습니다.")
         else:
             st.sidebar.error("엑셀 파일에 '테마'와 '퍼센테이지' 컬럼이 존재해야 합니다.")
     except Exception as e:
         st.sidebar.error(f"엑셀 파일을 읽는 중 오류 발생: {str(e)}")
+# 이력 저장은 불러오기와 별도로 파일마다 한 번만 (실패하면 다음 실행에서 다시 시도)
+if (uploaded_file is not None and save_to_history
+        and st.session_state.get('history_saved_file_id') != uploaded_file.file_id):
+    try:
+        uploaded_file.seek(0)
+        saved_rows = history_store.append_excel(uploaded_file, history_date)
+        st.session_state.history_saved_file_id = uploaded_file.file_id
+        saved_date = history_date if history_date is not None else "'날짜' 컬럼"
+        st.sidebar.success(f"{saved_date} 기준으로 {saved_rows}개 테마를 이력에 저장했습니다.")
+    except ValueError as e:
+        # 날짜 미선택, 컬럼 누락 등: 날짜를 고르거나 파일을 고치면 다시 저장됨
+        st.sidebar.warning(str(e))
+    except Exception as e:
+        st.sidebar.error(f"이력 저장 중 오류 발생: {str(e)}")
+
+# 이력에서 불러오기 (하루 또는 기간 누적 상승률)
+st.sidebar.header("이력에서 불러오기")
+stored_dates = history_store.dates()
+if stored_dates:
+    history_start = st.sidebar.selectbox("시작 날짜", stored_dates, index=0)
+    history_end = st.sidebar.selectbox("종료 날짜 (기간 누적)", stored_dates, index=0)
+    if st.sidebar.button("이력 데이터 불러오기"):
+        start, end = sorted([history_start, history_end])
+        if start == end:
+            st.session_state.theme_data = shared_pool.dataset(history_store.load_day(start))
+        else:
+            st.session_state.theme_data = shared_pool.dataset(history_store.load_period_returns(start, end))
+        st.sidebar.success(f"{start} ~ {end} 데이터를 불러왔습니다.")
+else:
+    st.sidebar.caption("저장된 이력이 없습니다.")
 
 # 사이드바 - 데이터 입력
 st.sidebar.header("테마 데이터 입력")
 theme_name = st.sidebar.text_input("테마 이름")
 theme_value = st.sidebar.number_input("상승률(%)", min_value=0.0, format="%.2f")
 
-if 'theme_data' not in st.session_state:
-    st.session_state.theme_data = {}
+# 세션의 테마 데이터는 항상 공유 데이터셋(ThemeDataset)으로 보관
+st.session_state.theme_data = shared_pool.dataset(st.session_state.get('theme_data', {}))
 
 if st.sidebar.button("데이터 추가"):
     if theme_name and theme_value:
-        st.session_state.theme_data[theme_name] = theme_value
+        st.session_state.theme_data = shared_pool.dataset(
+            st.session_state.theme_data.with_item(theme_name, theme_value)
+        )
         st.sidebar.success(f"테마 '{theme_name}'이(가) {theme_value}% 상승률로 추가되었습니다.")
 
 # 시각화 옵션
@@ -100,13 +162,33 @@ watermark_text = st.sidebar.text_input("워터마크 텍스트", "플스포")
 watermark_opacity = st.sidebar.slider("워터마크 투명도", 0.0, 1.0, 0.3)
 watermark_size = 85
 
+# 이미지 저장 옵션 (다운로드용, 메신저 전송 시 용량/인코딩 속도 조절)
+st.sidebar.header("이미지 저장 옵션")
+encoding_name = st.sidebar.selectbox("저장 형식", list(ENCODING_PRESETS))
+download_dpi = DPI_PRESETS[st.sidebar.selectbox("해상도", list(DPI_PRESETS), index=len(DPI_PRESETS) - 1)]
+encoding = dict(ENCODING_PRESETS[encoding_name])
+if encoding['format'] == 'png':
+    encoding['compress_level'] = st.sidebar.slider("PNG 압축 레벨 (0: 빠름 ~ 9: 작음)", 0, 9, 6)
+encoding_key = tuple(sorted(encoding.items()))
+
+# 실시간 시세 모드 (장중 자동 갱신)
+st.sidebar.header("실시간 시세 모드")
+live_enabled = st.sidebar.checkbox("실시간 시세로 트리맵 갱신", False)
+if live_enabled:
+    mapping_file = st.sidebar.file_uploader("종목-테마 매핑 파일 ('종목', '테마', '기준가' 컬럼)", type=["xlsx", "csv"])
+    live_source_type = st.sidebar.selectbox("시세 소스", ["파일 (tail)", "소켓 (host:port)"])
+    live_source_addr = st.sidebar.text_input("파일 이름 (시세 폴더 기준) 또는 host:port", "ticks.csv")
+    live_interval = st.sidebar.slider("갱신 주기(초)", 1, 30, 3)
+    live_threshold = st.sidebar.slider("레이아웃 재계산 임계값 (면적 비율 변화)", 0.0, 0.2, 0.02, step=0.01)
+    st.sidebar.caption(f"시세 파일 폴더: {LIVE_FEED_DIR} · 허용 호스트: {', '.join(LIVE_FEED_HOSTS)}")
+elif st.session_state.get('live_feed') is not None:
+    # 실시간 모드를 끄면 파일/소켓을 바로 닫음
+    st.session_state.pop('live_feed')['source'].close()
+
 # 현재 데이터 편집 (data_editor)
 st.sidebar.header("현재 데이터 (편집 가능)")
-df_data = {
-    '테마': list(st.session_state.theme_data.keys()),
-    '상승률(%)': list(st.session_state.theme_data.values())
-}
-df = pd.DataFrame(df_data)
+# 편집기용 DataFrame 은 데이터셋마다 한 번만 만들어 공유
+df = shared_pool.frame(st.session_state.theme_data)
 edited_df = st.sidebar.data_editor(
     df,
     num_rows="dynamic",
@@ -122,147 +204,222 @@ for idx, row in edited_df.iterrows():
         except:
             val = 0.0
         new_data[theme] = val
-st.session_state.theme_data = new_data
+st.session_state.theme_data = shared_pool.dataset(new_data)
+
+# 실시간 모드: 소스/집계기는 세션에 유지하고, 갱신 주기마다 이 부분만 다시 실행
+def open_live_feed():
+    if live_source_type.startswith("소켓"):
+        host, port = live_source_addr.rsplit(':', 1)
+        source = SocketSource(host, int(port))
+    else:
+        source = FileTailSource(live_source_addr)
+    return {
+        'key': (live_source_type, live_source_addr, mapping_file.file_id),
+        'source': source,
+        'aggregator': ThemeAggregator(load_mapping(mapping_file)),
+    }
+
+
+# 실시간 화면은 자주 갱신되므로 낮은 해상도로 그림
+LIVE_DPI = 100
+
+
+def live_view():
+    live = st.session_state.live_feed
+    if live.get('error') is None:
+        try:
+            live['aggregator'].update(live['source'].poll())
+        except OSError as e:
+            live['source'].close()
+            live['error'] = str(e)
+    if live.get('error'):
+        st.error(f"실시간 시세 연결이 끊어졌습니다. 마지막으로 받은 데이터를 표시합니다. ({live['error']})")
+    returns = live['aggregator'].theme_returns()
+    treemap = live['treemap']
+    treemap.update(returns)
+    dataset = st.session_state.theme_data = shared_pool.dataset(returns)
+    # 데이터와 사각형 배치가 같으면 인코딩한 이미지를 재사용 (같은 시세를 보는 세션끼리도 공유)
+    live_png = shared_pool.rendered(
+        ('live', dataset.digest, live['style'], treemap.layout_digest, font_prop is not None),
+        lambda: treemap.render_png(LIVE_DPI)
+    )
+    st.image(live_png, width='stretch')
+    st.caption(
+        f"누적 틱 {live['aggregator'].ticks_seen:,}개 · "
+        f"레이아웃 재계산 {treemap.relayouts}회 · 색상/라벨만 갱신 {treemap.recolors}회"
+    )
+
 
 # 트리맵 미리보기
 st.header("트리맵 미리보기")
-if st.session_state.theme_data:
-    try:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        # 상승률 기준 내림차순 정렬
-        sorted_data = sorted(st.session_state.theme_data.items(), key=lambda x: x[1], reverse=True)
-        labels = [item[0] for item in sorted_data]
-        values = [item[1] for item in sorted_data]
-        sizes = values
-
-        max_val = max(values) if values else 1
-        min_val = min(values) if values else 0
-        normalized_values = [
-            (val - min_val) / (max_val - min_val) if max_val > min_val else 0.5
-            for val in values
-        ]
-
-        # 내부 색상 지정:
-        # 사용자가 입력한 내부 색상 코드(custom_color_code)를 기본으로 하여,
-        # 최고 상승률 (n=1)은 원래 색상, 낮은 값 (n=0)은 초록 성분을 증가시켜 주황색에 가까워지도록.
-        # 여기서는 R와 B는 그대로 두고, G 값을 base_G + (target - base_G) * (1 - n) 로 계산합니다.
-        # 예를 들어, 만약 base 색상이 "#FF0000"이면, base RGB = (1,0,0)이고,
-        # target G 값을 0.65 (즉, 165/255)로 설정하여 n=0일 때 색상이 (1,0.65,0) (#FFA500)이 되도록 합니다.
-        base_rgb = to_rgb(custom_color_code)
-        target_green = 0.5  # 목표 G 값 (최저값에 해당)
-        colors = []
-        for n in normalized_values:
-            # n=1 -> G = base_rgb[1], n=0 -> G = target_green
-            new_green = base_rgb[1] + (target_green - base_rgb[1]) * (1 - n)
-            new_rgb = (base_rgb[0], new_green, base_rgb[2])
-            colors.append(to_hex(new_rgb))
-
-        if values:
-            norm_sizes = [size / sum(sizes) for size in sizes]
-            rects = squarify.squarify(norm_sizes, 0, 0, 1, 1)
-            for i, rect in enumerate(rects):
-                x, y, dx, dy = rect['x'], rect['y'], rect['dx'], rect['dy']
-                ax.add_patch(
-                    patches.Rectangle(
-                        (x, y), dx, dy,
-                        facecolor=colors[i],
-                        edgecolor='white',
-                        linewidth=2,
-                        alpha=0.8
-                    )
+if live_enabled:
+    if mapping_file is None:
+        st.info("실시간 모드를 사용하려면 종목-테마 매핑 파일을 업로드하세요.")
+    else:
+        try:
+            live = st.session_state.get('live_feed')
+            # 설정이 바뀌었거나 연결이 끊긴 경우 다시 연결
+            if (live is None or live.get('error')
+                    or live['key'] != (live_source_type, live_source_addr, mapping_file.file_id)):
+                if live is not None:
+                    live['source'].close()
+                live = st.session_state.live_feed = open_live_feed()
+            style = (custom_color_code, theme_font_size, value_font_size, line_spacing, live_threshold)
+            if live.get('style') != style:
+                live['style'] = style
+                live['treemap'] = LiveTreemap(
+                    custom_color_code, font_prop=font_prop, theme_font_size=theme_font_size,
+                    value_font_size=value_font_size, line_spacing=line_spacing,
+                    relayout_threshold=live_threshold
                 )
-                if font_prop is not None:
-                    ax.text(
-                        x + dx / 2,
-                        y + dy / 2 - line_spacing,
-                        f"{labels[i]}",
-                        fontproperties=font_prop,
-                        horizontalalignment='center',
-                        verticalalignment='center',
-                        fontsize=theme_font_size,
-                        fontweight='bold',
-                        color='white'
-                    )
-                    ax.text(
-                        x + dx / 2,
-                        y + dy / 2 + line_spacing,
-                        f"{values[i]}%",
-                        fontproperties=font_prop,
-                        horizontalalignment='center',
-                        verticalalignment='center',
-                        fontsize=value_font_size,
-                        fontweight='bold',
-                        color='white'
-                    )
-                else:
-                    ax.text(
-                        x + dx / 2,
-                        y + dy / 2 - line_spacing,
-                        f"{labels[i]}",
-                        horizontalalignment='center',
-                        verticalalignment='center',
-                        fontsize=theme_font_size,
-                        fontweight='bold',
-                        color='white'
-                    )
-                    ax.text(
-                        x + dx / 2,
-                        y + dy / 2 + line_spacing,
-                        f"{values[i]}%",
-                        horizontalalignment='center',
-                        verticalalignment='center',
-                        fontsize=value_font_size,
-                        fontweight='bold',
-                        color='white'
-                    )
-
-            if watermark_enabled:
-                if font_prop is not None:
-                    fig.text(
-                        0.5, 0.5, watermark_text,
-                        fontproperties=font_prop,
-                        fontsize=watermark_size,
-                        color='white',
-                        ha='center',
-                        va='center',
-                        alpha=watermark_opacity,
-                        fontweight='bold',
-                        rotation=0
-                    )
-                else:
-                    fig.text(
-                        0.5, 0.5, watermark_text,
-                        fontsize=watermark_size,
-                        color='white',
-                        ha='center',
-                        va='center',
-                        alpha=watermark_opacity,
-                        fontweight='bold',
-                        rotation=0
-                    )
-
-        if title_text:  # 제목이 있을 때만 표시
-            if font_prop is not None:
-                fig.suptitle(title_text, fontproperties=font_prop, fontsize=18)
-            else:
-                fig.suptitle(title_text, fontsize=18)
+            st.fragment(run_every=live_interval)(live_view)()
+        except Exception as e:
+            st.error(f"실시간 시세 연결 중 오류 발생: {str(e)}")
+            st.exception(e)
+elif st.session_state.theme_data:
+    try:
+        dataset = st.session_state.theme_data
+        layout = prepare_treemap(dataset, custom_color_code)
+        render_options = (
+            custom_color_code, title_text, theme_font_size, value_font_size, line_spacing,
+            watermark_enabled, watermark_text, watermark_opacity, watermark_size, font_prop is not None
+        )
 
-        ax.set_xlim(0, 1)
-        ax.set_ylim(0, 1)
-        ax.axis('off')
+        # 렌더링 결과는 세션이 아니라 공유 캐시에 보관 (같은 데이터/옵션이면 다시 그리지 않음)
+        def render_image(dpi, **encoding):
+            fig = Figure(figsize=(10, 6))
+            ax = fig.add_subplot()
+            draw_treemap(ax, layout, font_prop, theme_font_size, value_font_size, line_spacing)
+            decorate_figure(fig, font_prop, title_text, watermark_enabled, watermark_text,
+                            watermark_opacity, watermark_size)
+            return encode_figure(fig, dpi, **encoding)
 
-        st.pyplot(fig)
+        # 미리보기는 화면 표시용이므로 압축을 최소로 해서 빨리 만듦
+        preview_png = shared_pool.rendered(
+            (dataset.digest, render_options, 200, 'preview'),
+            lambda: render_image(200, format='png', compress_level=1)
+        )
+        st.image(preview_png, width='stretch')
 
-        buf = BytesIO()
-        fig.savefig(buf, format="png", dpi=300, bbox_inches='tight')
         st.download_button(
             label="트리맵 이미지 다운로드",
-            data=buf.getvalue(),
-            file_name="treemap.png",
-            mime="image/png"
+            data=shared_pool.rendered(
+                (dataset.digest, render_options, download_dpi, encoding_key),
+                lambda: render_image(download_dpi, **encoding)
+            ),
+            file_name=f"treemap.{EXTENSIONS[encoding['format']]}",
+            mime=MIME_TYPES[encoding['format']]
         )
+
+        # 딥줌 내보내기: 종목이 많아 한 장으로는 읽기 어려운 트리맵을 타일 피라미드로 저장
+        with st.expander("딥줌 내보내기 (대형 트리맵)"):
+            tile_size = st.selectbox("타일 크기(px)", [256, 512], index=0)
+            suggested_level = auto_max_level(layout, tile_size)
+            max_level = st.slider("최대 줌 레벨", 0, MAX_LEVEL, suggested_level)
+            st.caption(f"생성할 타일 수: {pyramid_tile_count(max_level, tile_size):,}장")
+            # 타일 zip 은 세션이 아니라 공유 캐시에 보관 (데이터/스타일이 바뀌면 키가 달라져 이전 zip 은 보이지 않음)
+            deepzoom_key = (
+                'deepzoom', dataset.digest, custom_color_code, theme_font_size, value_font_size,
+                line_spacing, font_prop is not None, tile_size, max_level
+            )
+
+            def build_deepzoom_zip():
+                out_dir = tempfile.mkdtemp(prefix="treemap_deepzoom_")
+                try:
+                    progress = st.progress(0.0)
+                    first_view = st.empty()
+                    for status in build_tile_pyramid(
+                        layout, out_dir, font_prop=font_prop, tile_size=tile_size,
+                        max_level=max_level, theme_font_size=theme_font_size,
+                        value_font_size=value_font_size, line_spacing=line_spacing
+                    ):
+                        progress.progress(status['tiles_done'] / status['tiles_total'],
+                                          text=f"레벨 {status['level']}/{status['max_level']} 완료")
+                        if status['level'] == 0:
+                            # 전체 피라미드가 끝나기 전에 첫 화면(레벨 0)을 먼저 보여줌
+                            first_view.image(os.path.join(out_dir, 'tiles', '0', '0_0.png'))
+                    return zip_pyramid(out_dir)
+                finally:
+                    shutil.rmtree(out_dir, ignore_errors=True)
+
+            if st.button("딥줌 타일 생성"):
+                deepzoom_zip = shared_pool.rendered(deepzoom_key, build_deepzoom_zip)
+            else:
+                deepzoom_zip = shared_pool.cached(deepzoom_key)
+            if deepzoom_zip is not None:
+                st.download_button(
+                    label="딥줌 타일 다운로드 (.zip, viewer.html 포함)",
+                    data=deepzoom_zip,
+                    file_name="treemap_deepzoom.zip",
+                    mime="application/zip"
+                )
     except Exception as e:
         st.error(f"트리맵 생성 중 오류 발생: {str(e)}")
         st.exception(e)
 else:
-    st.info("트리맵을 생성하려면 데이터를 추가하거나 샘플 데이터를 불러오세요.")
\ No newline at end of file
+    st.info("트리맵을 생성하려면 데이터를 추가하거나 샘플 데이터를 불러오세요.")
+
+# 모자이크 내보내기: 여러 트리맵을 한 장에 배치 (아침 리포트용)
+st.header("모자이크 내보내기")
+with st.expander("여러 트리맵을 한 장으로 묶기"):
+    mosaic_panels = []
+    current_data = dict(st.session_state.theme_data.items())
+    if current_data:
+        if st.checkbox("현재 테마 트리맵", True):
+            mosaic_panels.append(("전체 테마", current_data))
+        top_n = st.slider("상승/하락 상위 테마 수", 3, 30, 10)
+        if st.checkbox("상승 상위", True):
+            mosaic_panels.append((f"상승 상위 {top_n}", top_movers(current_data, top_n, gainers=True)))
+        if st.checkbox("하락 상위", False):
+            mosaic_panels.append((f"하락 상위 {top_n}", top_movers(current_data, top_n, gainers=False)))
+    sector_file = st.file_uploader("섹터별 트리맵 ('섹터', '테마', '퍼센테이지' 컬럼)", type=["xlsx"])
+    if sector_file is not None:
+        try:
+            mosaic_panels.extend(split_by_sector(pd.read_excel(sector_file)))
+        except Exception as e:
+            st.error(f"섹터 엑셀 파일을 읽는 중 오류 발생: {str(e)}")
+    for date in st.multiselect("이력 날짜별 트리맵", stored_dates):
+        mosaic_panels.append((date, history_store.load_day(date)))
+
+    mosaic_cols = st.slider("열 수", 1, 4, 2)
+    mosaic_dpi = DPI_PRESETS[st.selectbox("모자이크 해상도", list(DPI_PRESETS), index=1)]
+    if mosaic_panels and st.button("모자이크 생성"):
+        try:
+            panel_datasets = [(title, shared_pool.dataset(data)) for title, data in mosaic_panels]
+            mosaic_key = (
+                'mosaic', tuple((title, data.digest) for title, data in panel_datasets),
+                custom_color_code, title_text, theme_font_size, value_font_size, line_spacing,
+                watermark_enabled, watermark_text, watermark_opacity, watermark_size,
+                font_prop is not None, mosaic_cols, mosaic_dpi, encoding_key
+            )
+
+            def render_mosaic_image():
+                fig = render_mosaic(
+                    panel_datasets, custom_color_code, font_prop=font_prop, cols=mosaic_cols,
+                    theme_font_size=theme_font_size, value_font_size=value_font_size,
+                    line_spacing=line_spacing, title_text=title_text,
+                    watermark_enabled=watermark_enabled, watermark_text=watermark_text,
+                    watermark_opacity=watermark_opacity, watermark_size=watermark_size
+                )
+                return encode_figure(fig, mosaic_dpi, **encoding)
+
+            mosaic_image = shared_pool.rendered(mosaic_key, render_mosaic_image)
+            st.image(mosaic_image, width='stretch')
+            st.download_button(
+                label="모자이크 이미지 다운로드",
+                data=mosaic_image,
+                file_name=f"treemap_mosaic.{EXTENSIONS[encoding['format']]}",
+                mime=MIME_TYPES[encoding['format']]
+            )
+        except Exception as e:
+            st.error(f"모자이크 생성 중 오류 발생: {str(e)}")
+            st.exception(e)
+
+# 세션 메모리 사용량 (공유 객체는 세션 고유 사용량에서 제외)
+with st.sidebar.expander("세션 메모리 사용량"):
+    memory_report, own_bytes = session_memory_report(st.session_state, shared_pool)
+    st.metric("이 세션 고유 사용량", f"{own_bytes / 1024:,.1f} KB")
+    if memory_report['측정 제외'].any():
+        st.caption("'측정 제외' 에 표시된 객체(Figure 등)는 크기를 알 수 없어 사용량에 포함되지 않았습니다.")
+    st.dataframe(memory_report, hide_index=True)
+    st.json(shared_pool.stats())
\ No newline at end of file
@@ -0,0 +1,77 @@
+import argparse
+import os
+import random
+import time
+
+import matplotlib.font_manager as fm
+import pandas as pd
+from matplotlib.figure import Figure
+
+from image_encoding import DPI_PRESETS, ENCODING_PRESETS, render_figure, encode_image
+from treemap_render import prepare_treemap, draw_treemap
+
+# 이미지 저장 형식별 인코딩 시간과 용량 비교
+# 사용법: python bench_encoding.py --themes 30 --repeat 3
+
+FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'chart', 'fonts', 'Pretendard-SemiBold.otf')
+
+
+def sample_figure(n_themes, font_prop):
+    rng = random.Random(0)
+    theme_data = {f"테마{i}": round(rng.uniform(0.5, 15.0), 2) for i in range(n_themes)}
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    draw_treemap(ax, prepare_treemap(theme_data, "#FF0000"), font_prop, 22, 22, 0.04)
+    return fig
+
+
+# 가장 빠른 값 사용 (다른 프로세스 영향 최소화)
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_benchmark(n_themes, dpis, compress_levels, repeat):
+    font_prop = None
+    if os.path.exists(FONT_PATH):
+        fm.fontManager.addfont(FONT_PATH)
+        font_prop = fm.FontProperties(fname=FONT_PATH)
+    fig = sample_figure(n_themes, font_prop)
+
+    rows = []
+    for dpi in dpis:
+        # 그리기(Agg 렌더링 + 여백 자르기)와 인코딩을 따로 측정
+        # 인코딩은 미리 그려둔 같은 이미지로 형식만 바꿔가며 측정하므로 그리기 시간이 섞이지 않음
+        draw_seconds, image = best_time(lambda: render_figure(fig, dpi), repeat)
+        for name, options in ENCODING_PRESETS.items():
+            levels = compress_levels if options['format'] == 'png' else [None]
+            for level in levels:
+                kwargs = dict(options)
+                if level is not None:
+                    kwargs['compress_level'] = level
+                seconds, data = best_time(lambda: encode_image(image, dpi=dpi, **kwargs), repeat)
+                rows.append({
+                    'dpi': dpi,
+                    '형식': name,
+                    'zlib': '' if level is None else level,
+                    '그리기(ms)': draw_seconds * 1000,
+                    '인코딩(ms)': seconds * 1000,
+                    '전체(ms)': (draw_seconds + seconds) * 1000,
+                    '크기(KB)': len(data) / 1024,
+                })
+    return pd.DataFrame(rows).round(1)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="트리맵 이미지 인코딩 벤치마크")
+    parser.add_argument('--themes', type=int, default=30, help="트리맵 테마 수")
+    parser.add_argument('--dpi', type=int, nargs='+', default=sorted(DPI_PRESETS.values()))
+    parser.add_argument('--zlib', type=int, nargs='+', default=[1, 6, 9], help="비교할 PNG 압축 레벨")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    print(run_benchmark(args.themes, args.dpi, args.zlib, args.repeat).to_string(index=False))
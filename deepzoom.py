@@ -0,0 +1,290 @@
+import json
+import math
+import os
+import zipfile
+from io import BytesIO
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PatchCollection
+import matplotlib.patches as patches
+
+from treemap_render import font_options
+
+# 미리보기(app.py)의 기본 그림 비율 10x6 인치
+ASPECT = 6 / 10
+# 앱 미리보기에서 폰트 크기는 10인치(=720pt) 폭 기준이므로 이미지 폭에 비례해 환산
+BASE_WIDTH_PT = 720
+# 이 크기(px)보다 작은 글자는 해당 레벨에서 그리지 않음 (확대하면 나타남)
+MIN_LABEL_PX = 6
+# 최대 줌 레벨 상한 (레벨 6 = 타일 256px 기준 16384px 폭, 약 3400장)
+MAX_LEVEL = 6
+# 자동으로 고르는 레벨의 상한 (레벨 4 = 타일 약 220장). 그보다 높은 레벨은 직접 선택해야 함
+SUGGESTED_MAX_LEVEL = 4
+# 자동 레벨 계산 시 라벨이 읽혀야 하는 사각형 비율
+LABELED_RATIO = 0.9
+
+
+# 줌 레벨별 전체 이미지 크기(px): 레벨 0은 타일 하나 폭, 레벨이 오를 때마다 2배
+def level_size(level, tile_size):
+    width = tile_size * (2 ** level)
+    height = max(1, int(round(width * ASPECT)))
+    return width, height
+
+
+# 레벨별 타일 개수 (열, 행)
+def level_grid(level, tile_size):
+    width, height = level_size(level, tile_size)
+    return math.ceil(width / tile_size), math.ceil(height / tile_size)
+
+
+# 사각형 대부분(LABELED_RATIO)의 라벨이 읽힐 정도까지 확대되는 레벨을 자동 계산
+# 가장 작은 사각형 하나(0% 테마 같은 가는 조각)가 레벨을 끌어올리지 않도록 분위수로 고름
+def auto_max_level(layout, tile_size, min_rect_px=48, limit=SUGGESTED_MAX_LEVEL):
+    rects = layout['rects']
+    if len(rects) == 0:
+        return 0
+    # 이미지 폭 1px 당 단위 좌표: 가로는 dx * width, 세로는 dy * width * ASPECT
+    smallest = np.minimum(rects[:, 2], rects[:, 3] * ASPECT)
+    smallest = smallest[smallest > 0]
+    if len(smallest) == 0:
+        return 0
+    # 사각형마다 짧은 변이 min_rect_px 이상이 되는 레벨
+    needed = np.maximum(0, np.ceil(np.log2(min_rect_px / smallest / tile_size)))
+    return int(min(limit, np.quantile(needed, LABELED_RATIO, method='lower')))
+
+
+# 레벨 0 ~ max_level 전체 타일 수
+def pyramid_tile_count(max_level, tile_size):
+    return sum(cols * rows for cols, rows in (level_grid(z, tile_size) for z in range(max_level + 1)))
+
+
+# 한 타일 렌더링: 타일 영역과 겹치는 사각형/라벨만 그림
+def _render_tile(fig, layout, font_prop, level, col, row, tile_size,
+                 theme_font_size, value_font_size, line_spacing):
+    width, height = level_size(level, tile_size)
+    tile_w = min(tile_size, width - col * tile_size)
+    tile_h = min(tile_size, height - row * tile_size)
+
+    # 타일 영역 (단위 좌표, y축은 아래가 0이므로 행 번호를 뒤집어 계산)
+    x0 = col * tile_size / width
+    x1 = (col * tile_size + tile_w) / width
+    y1 = 1 - row * tile_size / height
+    y0 = 1 - (row * tile_size + tile_h) / height
+
+    rects = layout['rects']
+    visible = np.nonzero(
+        (rects[:, 0] < x1) & (rects[:, 0] + rects[:, 2] > x0)
+        & (rects[:, 1] < y1) & (rects[:, 1] + rects[:, 3] > y0)
+    )[0]
+
+    fig.clear()
+    fig.set_size_inches(tile_w / 72, tile_h / 72)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(x0, x1)
+    ax.set_ylim(y0, y1)
+    ax.axis('off')
+
+    # 전체 이미지 폭에 비례한 배율 (1pt = 1px, dpi 72 기준)
+    scale = width / BASE_WIDTH_PT
+    colors = layout['colors']
+    ax.add_collection(PatchCollection(
+        [patches.Rectangle((rects[i, 0], rects[i, 1]), rects[i, 2], rects[i, 3]) for i in visible],
+        facecolors=[colors[i] for i in visible],
+        edgecolors='white',
+        linewidths=2 * scale,
+        alpha=0.8
+    ))
+
+    labels, values = layout['labels'], layout['values']
+    for i in visible:
+        x, y, dx, dy = rects[i]
+        rect_w_px = dx * width
+        rect_h_px = dy * height
+        label = f"{labels[i]}"
+        value = f"{values[i]}%"
+        # 사각형 안에 들어가도록 폰트 크기를 줄임 (한글은 대략 1em 폭)
+        fit = min(rect_h_px * 0.3, rect_w_px * 0.9 / max(len(label), len(value), 1))
+        theme_px = min(theme_font_size * scale, fit)
+        value_px = min(value_font_size * scale, fit)
+        if min(theme_px, value_px) < MIN_LABEL_PX:
+            continue
+        # 줄 간격은 앱과 같은 비율을 쓰되, 글자가 줄어든 만큼 함께 줄임
+        spacing = line_spacing * min(1.0, fit / (max(theme_font_size, value_font_size) * scale))
+        # 글자 영역(대략)이 타일과 겹치지 않으면 건너뜀
+        half_w = max(len(label) * theme_px, len(value) * value_px * 0.6) / 2 / width
+        half_h = spacing + max(theme_px, value_px) / height
+        cx, cy = x + dx / 2, y + dy / 2
+        if cx + half_w < x0 or cx - half_w > x1 or cy + half_h < y0 or cy - half_h > y1:
+            continue
+        ax.text(
+            x + dx / 2, y + dy / 2 - spacing, label,
+            horizontalalignment='center', verticalalignment='center',
+            fontsize=theme_px, fontweight='bold', color='white',
+            **font_options(font_prop)
+        )
+        ax.text(
+            x + dx / 2, y + dy / 2 + spacing, value,
+            horizontalalignment='center', verticalalignment='center',
+            fontsize=value_px, fontweight='bold', color='white',
+            **font_options(font_prop)
+        )
+    return len(visible)
+
+
+# 타일 피라미드 생성
+# out_dir/tiles/{레벨}/{열}_{행}.png 와 manifest.json, viewer.html 을 씀
+# 낮은 레벨부터 만들고 레벨이 끝날 때마다 진행 상황을 yield 하므로,
+# 호출하는 쪽에서 첫 화면(레벨 0)을 전체 완료 전에 보여줄 수 있음
+def build_tile_pyramid(layout, out_dir, font_prop=None, tile_size=256, max_level=None,
+                       theme_font_size=22, value_font_size=22, line_spacing=0.04):
+    if max_level is None:
+        max_level = auto_max_level(layout, tile_size)
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {
+        'tile_size': tile_size,
+        'max_level': max_level,
+        'levels': [
+            {'width': level_size(z, tile_size)[0], 'height': level_size(z, tile_size)[1],
+             'cols': level_grid(z, tile_size)[0], 'rows': level_grid(z, tile_size)[1]}
+            for z in range(max_level + 1)
+        ],
+    }
+    # 뷰어는 아직 없는 타일을 낮은 레벨로 대체하므로 manifest/뷰어를 먼저 기록
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    write_viewer(out_dir, manifest)
+
+    total = pyramid_tile_count(max_level, tile_size)
+    done = 0
+    # Figure 하나를 재사용해서 메모리 사용량을 타일 한 장 수준으로 유지
+    fig = Figure(dpi=72, facecolor='white')
+    FigureCanvasAgg(fig)
+    for z, level in enumerate(manifest['levels']):
+        level_dir = os.path.join(out_dir, 'tiles', str(z))
+        os.makedirs(level_dir, exist_ok=True)
+        for row in range(level['rows']):
+            for col in range(level['cols']):
+                _render_tile(fig, layout, font_prop, z, col, row, tile_size,
+                             theme_font_size, value_font_size, line_spacing)
+                fig.savefig(os.path.join(level_dir, f"{col}_{row}.png"), dpi=72)
+                done += 1
+        yield {'level': z, 'max_level': max_level, 'tiles_done': done, 'tiles_total': total}
+
+
+# 타일 폴더 전체를 메모리에서 zip 으로 묶음 (서버에 임시 zip 파일을 남기지 않음)
+# 타일은 이미 압축된 PNG 라서 다시 압축하지 않고 그대로 저장
+def zip_pyramid(out_dir):
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        for root, _, files in os.walk(out_dir):
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                compress = zipfile.ZIP_STORED if name.endswith('.png') else zipfile.ZIP_DEFLATED
+                zf.write(path, os.path.relpath(path, out_dir), compress_type=compress)
+    return buf.getvalue()
+
+
+# 의존성 없는 간단한 HTML 뷰어 (드래그로 이동, 휠로 확대/축소)
+# file:// 로 열어도 동작하도록 manifest 를 HTML 안에 직접 넣음
+def write_viewer(out_dir, manifest):
+    with open(os.path.join(out_dir, 'viewer.html'), 'w', encoding='utf-8') as f:
+        f.write(VIEWER_HTML.replace('__MANIFEST__', json.dumps(manifest)))
+
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>트리맵 딥줌 뷰어</title>
+<style>
+  html, body { margin: 0; height: 100%; overflow: hidden; background: #fff; }
+  canvas { display: block; cursor: grab; }
+</style>
+</head>
+<body>
+<canvas id="view"></canvas>
+<script>
+const canvas = document.getElementById('view');
+const ctx = canvas.getContext('2d');
+const cache = {};
+let manifest = null;
+// 화면 좌표 = (이미지 좌표(레벨 0 기준 px) - offset) * zoom
+let zoom = 1, offsetX = 0, offsetY = 0;
+
+function tile(z, col, row) {
+  const key = z + '/' + col + '_' + row;
+  if (!(key in cache)) {
+    const img = new Image();
+    img.onload = draw;
+    // 아직 생성되지 않은 타일은 잠시 후 다시 시도
+    img.onerror = () => { setTimeout(() => { delete cache[key]; draw(); }, 1000); };
+    img.src = 'tiles/' + key + '.png';
+    cache[key] = img;
+  }
+  const img = cache[key];
+  return img.complete && img.naturalWidth ? img : null;
+}
+
+function drawLevel(z) {
+  const level = manifest.levels[z];
+  const base = manifest.levels[0];
+  const s = zoom * base.width / level.width;
+  const ts = manifest.tile_size;
+  for (let row = 0; row < level.rows; row++) {
+    for (let col = 0; col < level.cols; col++) {
+      const x = (col * ts * base.width / level.width - offsetX) * zoom;
+      const y = (row * ts * base.width / level.width - offsetY) * zoom;
+      if (x > canvas.width || y > canvas.height || x + ts * s < 0 || y + ts * s < 0) continue;
+      const img = tile(z, col, row);
+      if (img) ctx.drawImage(img, x, y, img.naturalWidth * s, img.naturalHeight * s);
+    }
+  }
+}
+
+function draw() {
+  if (!manifest) return;
+  ctx.fillStyle = '#fff';
+  ctx.fillRect(0, 0, canvas.width, canvas.height);
+  const want = Math.max(0, Math.min(manifest.max_level, Math.ceil(Math.log2(zoom))));
+  // 낮은 레벨을 먼저 깔고 그 위에 원하는 레벨을 덮어 빈 곳이 없도록 함
+  for (let z = 0; z <= want; z++) drawLevel(z);
+}
+
+function resize() {
+  canvas.width = window.innerWidth;
+  canvas.height = window.innerHeight;
+  draw();
+}
+
+let drag = null;
+canvas.addEventListener('mousedown', e => { drag = [e.clientX, e.clientY]; });
+window.addEventListener('mouseup', () => { drag = null; });
+window.addEventListener('mousemove', e => {
+  if (!drag) return;
+  offsetX -= (e.clientX - drag[0]) / zoom;
+  offsetY -= (e.clientY - drag[1]) / zoom;
+  drag = [e.clientX, e.clientY];
+  draw();
+});
+canvas.addEventListener('wheel', e => {
+  e.preventDefault();
+  const factor = e.deltaY < 0 ? 1.2 : 1 / 1.2;
+  const maxZoom = 2 ** (manifest.max_level + 1);
+  const next = Math.min(maxZoom, Math.max(0.25, zoom * factor));
+  offsetX += e.clientX / zoom - e.clientX / next;
+  offsetY += e.clientY / zoom - e.clientY / next;
+  zoom = next;
+  draw();
+}, { passive: false });
+window.addEventListener('resize', resize);
+
+manifest = __MANIFEST__;
+zoom = Math.min(window.innerWidth / manifest.levels[0].width, window.innerHeight / manifest.levels[0].height);
+resize();
+</script>
+</body>
+</html>
+"""
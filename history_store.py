@@ -0,0 +1,137 @@
+import argparse
+import datetime
+import numbers
+import os
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+
+DEFAULT_DB_PATH = os.path.join(os.getcwd(), 'theme_history.db')
+
+# (날짜, 테마) 가 기본키이고 WITHOUT ROWID 라서 날짜 순으로 묶여 저장됨
+# -> 날짜/기간 조회는 기본키 범위 검색, 테마별 조회는 (theme, date) 인덱스 사용
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS theme_history (
+    date TEXT NOT NULL,
+    theme TEXT NOT NULL,
+    percentage REAL NOT NULL,
+    size REAL,
+    PRIMARY KEY (date, theme)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_theme_history_theme ON theme_history (theme, date);
+"""
+
+
+# 날짜를 'YYYY-MM-DD' 문자열로 통일 (문자열 비교 = 날짜 비교)
+# 문자열, date/datetime, 20240102 같은 숫자를 받고, 비어 있거나 해석할 수 없으면 ValueError
+def to_date_key(value):
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        return value.isoformat()
+    # 엑셀의 숫자 날짜(20240102, 빈 칸이 섞이면 20240102.0)는 문자열로 바꿔서 해석
+    # (숫자를 그대로 넘기면 pandas 가 1970-01-01 기준 나노초로 해석함)
+    if isinstance(value, numbers.Number) and not isinstance(value, bool) and not pd.isna(value):
+        if not float(value).is_integer():
+            raise ValueError(f"날짜를 해석할 수 없습니다: {value!r}")
+        value = str(int(value))
+    try:
+        timestamp = pd.Timestamp(value)
+    except (ValueError, TypeError):
+        raise ValueError(f"날짜를 해석할 수 없습니다: {value!r}") from None
+    if pd.isna(timestamp):
+        raise ValueError("날짜가 비어 있습니다.")
+    return timestamp.date().isoformat()
+
+
+# 날짜별 테마 데이터 저장소 (SQLite 파일 하나)
+class ThemeHistoryStore:
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # Streamlit 은 세션마다 다른 스레드에서 실행되므로 호출마다 연결을 새로 염
+        return closing(sqlite3.connect(self.path))
+
+    # 하루치 데이터 추가 (같은 날짜/테마가 이미 있으면 덮어씀)
+    def append_day(self, date, theme_data, sizes=None):
+        date_key = to_date_key(date)
+        sizes = sizes or {}
+        rows = [
+            (date_key, str(theme), float(pct), None if sizes.get(theme) is None else float(sizes[theme]))
+            for theme, pct in theme_data.items()
+        ]
+        with self._connect() as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO theme_history VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    # 엑셀 파일 추가: '테마', '퍼센테이지' 컬럼 필수, '크기' 컬럼은 선택
+    # '날짜' 컬럼이 있으면 행마다 그 날짜로, 없으면 date 인자로 저장
+    def append_excel(self, file, date=None):
+        df = pd.read_excel(file)
+        if "테마" not in df.columns or "퍼센테이지" not in df.columns:
+            raise ValueError("엑셀 파일에 '테마'와 '퍼센테이지' 컬럼이 존재해야 합니다.")
+        if "날짜" not in df.columns:
+            if date is None:
+                raise ValueError("엑셀 파일에 '날짜' 컬럼이 없으면 저장할 날짜를 지정해야 합니다.")
+            df["날짜"] = date
+        # 테마/상승률/날짜 중 하나라도 빈 행은 저장하지 않음
+        df = df.dropna(subset=["테마", "퍼센테이지", "날짜"])
+        count = 0
+        for day, group in df.groupby(df["날짜"].map(to_date_key)):
+            sizes = dict(zip(group["테마"], group["크기"])) if "크기" in group.columns else None
+            count += self.append_day(day, dict(zip(group["테마"], group["퍼센테이지"])), sizes)
+        return count
+
+    # 저장된 날짜 목록 (최신순)
+    def dates(self):
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT DISTINCT date FROM theme_history ORDER BY date DESC"
+            )]
+
+    # 하루치 {테마: 상승률}
+    def load_day(self, date):
+        with self._connect() as conn:
+            return dict(conn.execute(
+                "SELECT theme, percentage FROM theme_history WHERE date = ?", (to_date_key(date),)
+            ).fetchall())
+
+    # 기간 조회: date, theme, percentage, size 컬럼의 DataFrame (themes 로 테마 제한 가능)
+    def load_range(self, start, end, themes=None):
+        query = "SELECT date, theme, percentage, size FROM theme_history WHERE date BETWEEN ? AND ?"
+        params = [to_date_key(start), to_date_key(end)]
+        if themes:
+            query += f" AND theme IN ({', '.join('?' * len(themes))})"
+            params.extend(themes)
+        with self._connect() as conn:
+            return pd.read_sql_query(query + " ORDER BY date, theme", conn, params=params)
+
+    # 기간 누적 상승률 {테마: 상승률}: 일별 상승률을 복리로 합산
+    def load_period_returns(self, start, end):
+        df = self.load_range(start, end)
+        if df.empty:
+            return {}
+        growth = (1 + df["percentage"] / 100).groupby(df["theme"]).prod()
+        return ((growth - 1) * 100).round(2).to_dict()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="테마 데이터 이력 저장소")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="SQLite 파일 경로")
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help="엑셀 파일을 이력에 추가")
+    add.add_argument('files', nargs='+')
+    add.add_argument('--date', help="저장 날짜 (YYYY-MM-DD, 엑셀에 '날짜' 컬럼이 없을 때)")
+    show = commands.add_parser('show', help="날짜 또는 기간 조회")
+    show.add_argument('start')
+    show.add_argument('end', nargs='?')
+    args = parser.parse_args()
+
+    store = ThemeHistoryStore(args.db)
+    if args.command == 'add':
+        for path in args.files:
+            print(f"{path}: {store.append_excel(path, args.date)}건 저장")
+    else:
+        print(store.load_range(args.start, args.end or args.start).to_string(index=False))
@@ -0,0 +1,82 @@
+import math
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# 해상도 프리셋 (메신저 전송용은 낮게, 인쇄용은 높게)
+DPI_PRESETS = {
+    "메신저 (100dpi)": 100,
+    "웹 (150dpi)": 150,
+    "고해상도 (200dpi)": 200,
+    "인쇄 (300dpi)": 300,
+}
+
+# 저장 형식 프리셋
+# 트리맵은 단색 사각형이라 색 수가 적어서 팔레트 PNG 와 무손실 WebP 의 효과가 큼
+ENCODING_PRESETS = {
+    "PNG (기본)": {'format': 'png'},
+    "PNG 팔레트 (256색)": {'format': 'png', 'colors': 256},
+    "PNG 팔레트 (64색, 최소 용량)": {'format': 'png', 'colors': 64},
+    "WebP 무손실": {'format': 'webp', 'lossless': True},
+    "WebP (품질 85)": {'format': 'webp', 'quality': 85},
+    "JPEG (품질 90)": {'format': 'jpeg', 'quality': 90},
+}
+
+MIME_TYPES = {'png': 'image/png', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+EXTENSIONS = {'png': 'png', 'webp': 'webp', 'jpeg': 'jpg'}
+
+
+# Figure 를 dpi 로 한 번 그려서 RGB 이미지로 돌려줌
+# tight: savefig(bbox_inches='tight') 처럼 내용 주변 pad_inches 여백만 남기고 잘라냄
+# (savefig 와 달리 다시 그리지 않고 그려진 버퍼를 자르므로 그림 밖으로 나간 부분은 포함하지 않음)
+def render_figure(fig, dpi=300, tight=True, pad_inches=0.1):
+    if not isinstance(fig.canvas, FigureCanvasAgg):
+        FigureCanvasAgg(fig)
+    original_dpi = fig.dpi
+    fig.set_dpi(dpi)
+    try:
+        fig.canvas.draw()
+        # 트리맵 배경은 불투명한 흰색이므로 RGB 로 바꿔도 결과가 같음
+        image = Image.fromarray(np.asarray(fig.canvas.buffer_rgba())).convert('RGB')
+        if tight:
+            bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(pad_inches)
+            # 인치 -> 픽셀 (이미지 y 좌표는 위쪽이 0)
+            image = image.crop((
+                max(0, math.floor(bbox.x0 * dpi)),
+                max(0, math.floor(image.height - bbox.y1 * dpi)),
+                min(image.width, math.ceil(bbox.x1 * dpi)),
+                min(image.height, math.ceil(image.height - bbox.y0 * dpi)),
+            ))
+    finally:
+        fig.set_dpi(original_dpi)
+    return image
+
+
+# 이미지를 지정한 형식으로 인코딩해서 바이트로 돌려줌
+# compress_level: PNG zlib 압축 레벨 (0=무압축/가장 빠름, 9=가장 작음/가장 느림)
+# colors: 지정하면 해당 색 수의 팔레트 PNG 로 양자화
+# quality/lossless: WebP, JPEG 옵션
+def encode_image(image, format='png', compress_level=6, colors=None, quality=85, lossless=False, dpi=None):
+    out = BytesIO()
+    extra = {'dpi': (dpi, dpi)} if dpi else {}
+    if format == 'png':
+        if colors is not None:
+            image = image.quantize(colors=colors, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+        image.save(out, format='PNG', compress_level=compress_level, **extra)
+    elif format == 'webp':
+        # method 는 0(빠름)~6(작음); 무손실은 속도/용량 균형이 좋은 4 사용
+        image.save(out, format='WEBP', lossless=lossless, quality=100 if lossless else quality, method=4)
+    elif format == 'jpeg':
+        image.save(out, format='JPEG', quality=quality, optimize=False, **extra)
+    else:
+        raise ValueError(f"지원하지 않는 이미지 형식입니다: {format}")
+    return out.getvalue()
+
+
+# Figure 를 그려서 바로 인코딩 (그리기 1번 + 인코딩 1번)
+def encode_figure(fig, dpi=300, format='png', compress_level=6, colors=None,
+                  quality=85, lossless=False, tight=True):
+    return encode_image(render_figure(fig, dpi, tight=tight), format, compress_level,
+                        colors, quality, lossless, dpi=dpi)
@@ -0,0 +1,254 @@
+import argparse
+import hashlib
+import os
+import random
+import socket
+import time
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from treemap_render import prepare_treemap, draw_treemap, compute_colors, treemap_areas
+from image_encoding import encode_figure
+
+# 앱에서 열 수 있는 시세 파일 폴더와 소켓 호스트 (공유 서버에서 임의 경로/호스트 접근 방지)
+# 환경 변수로 바꿀 수 있음: LIVE_FEED_DIR=/data/ticks LIVE_FEED_HOSTS=127.0.0.1,feed.local
+LIVE_FEED_DIR = os.environ.get('LIVE_FEED_DIR', os.path.join(os.getcwd(), 'live_feeds'))
+LIVE_FEED_HOSTS = [
+    host.strip() for host in os.environ.get('LIVE_FEED_HOSTS', '127.0.0.1,localhost').split(',') if host.strip()
+]
+
+
+# 시세 한 줄 파싱: "종목,가격" (공백/빈 줄/잘못된 줄은 무시)
+def parse_tick_line(line):
+    parts = line.strip().split(',')
+    if len(parts) < 2 or not parts[0]:
+        return None
+    try:
+        return parts[0].strip(), float(parts[1])
+    except ValueError:
+        return None
+
+
+# base_dir 기준 상대 경로를 절대 경로로 바꾸고, base_dir 밖(../, 절대 경로, 심볼릭 링크)이면 거부
+def resolve_feed_path(path, base_dir=LIVE_FEED_DIR):
+    base = os.path.realpath(base_dir)
+    resolved = os.path.realpath(os.path.join(base, path))
+    if os.path.commonpath([base, resolved]) != base:
+        raise ValueError(f"시세 파일은 '{base}' 폴더 안에 있어야 합니다: {path}")
+    return resolved
+
+
+# 시세 소스: 파일 끝에 추가되는 줄을 읽음 (tail -f 와 같은 방식)
+# poll() 은 지금까지 들어온 틱만 돌려주고 기다리지 않음
+# path 는 base_dir(기본 LIVE_FEED_DIR) 안의 상대 경로
+class FileTailSource:
+    def __init__(self, path, from_start=False, base_dir=LIVE_FEED_DIR):
+        os.makedirs(base_dir, exist_ok=True)
+        path = self.path = resolve_feed_path(path, base_dir)
+        # 생성기가 아직 시작되지 않았어도 기다릴 수 있도록 빈 파일을 만들어 둠
+        open(path, 'a', encoding='utf-8').close()
+        self.file = open(path, 'r', encoding='utf-8')
+        if not from_start:
+            self.file.seek(0, os.SEEK_END)
+        self.partial = ''
+
+    def poll(self):
+        chunk = self.file.read()
+        if not chunk:
+            return []
+        lines = (self.partial + chunk).split('\n')
+        # 마지막 줄은 아직 다 쓰이지 않았을 수 있으므로 다음 poll 로 넘김
+        self.partial = lines.pop()
+        return [tick for tick in map(parse_tick_line, lines) if tick is not None]
+
+    def close(self):
+        self.file.close()
+
+
+# 시세 소스: TCP 소켓에서 줄 단위 틱을 읽음
+# (테스트용 서버 예: tail -f ticks.csv | nc -lk 9000)
+# 연결이 끊기면 poll() 이 ConnectionError 를 냄 (오래된 데이터를 계속 보여주지 않도록)
+class SocketSource:
+    def __init__(self, host, port, allowed_hosts=LIVE_FEED_HOSTS):
+        if host not in allowed_hosts:
+            raise ValueError(f"허용되지 않은 시세 호스트입니다: {host} (허용: {', '.join(allowed_hosts)})")
+        self.sock = socket.create_connection((host, port), timeout=5)
+        self.sock.setblocking(False)
+        self.partial = b''
+        self.disconnected = False
+
+    def poll(self):
+        chunks = []
+        while True:
+            try:
+                data = self.sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            if not data:
+                # 이번에 받은 틱은 돌려주고, 다음 poll 에서 오류를 냄
+                self.disconnected = True
+                break
+            chunks.append(data)
+        if not chunks:
+            if self.disconnected:
+                raise ConnectionError("시세 서버가 연결을 끊었습니다.")
+            return []
+        lines = (self.partial + b''.join(chunks)).split(b'\n')
+        self.partial = lines.pop()
+        ticks = (parse_tick_line(line.decode('utf-8', errors='ignore')) for line in lines)
+        return [tick for tick in ticks if tick is not None]
+
+    def close(self):
+        self.sock.close()
+
+
+# 종목별 틱을 테마별 평균 상승률로 누적 집계
+# 틱마다 전체를 다시 계산하지 않고, 바뀐 종목의 변화량만 테마 합계에 더함
+class ThemeAggregator:
+    # mapping: '종목', '테마', '기준가' 컬럼을 가진 DataFrame
+    def __init__(self, mapping):
+        mapping = mapping.dropna(subset=['종목', '테마', '기준가'])
+        # 한 종목이 여러 테마에 속할 수 있으므로 종목 -> 매핑 행 번호 목록
+        self.index = {}
+        for i, ticker in enumerate(mapping['종목']):
+            self.index.setdefault(str(ticker), []).append(i)
+        self.themes = list(dict.fromkeys(mapping['테마']))
+        theme_pos = {theme: i for i, theme in enumerate(self.themes)}
+        self.ticker_theme = np.array([theme_pos[theme] for theme in mapping['테마']], dtype=np.intp)
+        self.base_price = mapping['기준가'].to_numpy(dtype=float)
+        self.returns = np.zeros(len(mapping))
+        self.theme_sum = np.zeros(len(self.themes))
+        self.theme_count = np.bincount(self.ticker_theme, minlength=len(self.themes)).astype(float)
+        self.ticks_seen = 0
+
+    def update(self, ticks):
+        if not ticks:
+            return 0
+        # 같은 배치 안에서 한 종목이 여러 번 오면 마지막 가격만 사용
+        latest = {}
+        for ticker, price in ticks:
+            if ticker in self.index:
+                latest[ticker] = price
+        self.ticks_seen += len(ticks)
+        if not latest:
+            return 0
+        idx, prices = [], []
+        for ticker, price in latest.items():
+            rows = self.index[ticker]
+            idx.extend(rows)
+            prices.extend([price] * len(rows))
+        idx = np.asarray(idx, dtype=np.intp)
+        prices = np.asarray(prices, dtype=float)
+        new_returns = (prices / self.base_price[idx] - 1) * 100
+        np.add.at(self.theme_sum, self.ticker_theme[idx], new_returns - self.returns[idx])
+        self.returns[idx] = new_returns
+        return len(latest)
+
+    # 현재 테마별 상승률 {테마: 상승률(%)} (소수점 둘째 자리)
+    def theme_returns(self):
+        averages = np.round(self.theme_sum / np.maximum(self.theme_count, 1), 2)
+        return dict(zip(self.themes, averages.tolist()))
+
+
+# 실시간 트리맵: 순위나 면적 비율이 임계값 이상 바뀔 때만 레이아웃을 다시 계산하고,
+# 그 외에는 기존 사각형을 유지한 채 색상과 라벨만 갱신
+class LiveTreemap:
+    def __init__(self, custom_color_code, font_prop=None, theme_font_size=22,
+                 value_font_size=22, line_spacing=0.04, relayout_threshold=0.02):
+        self.custom_color_code = custom_color_code
+        self.font_prop = font_prop
+        self.theme_font_size = theme_font_size
+        self.value_font_size = value_font_size
+        self.line_spacing = line_spacing
+        self.relayout_threshold = relayout_threshold
+        self.fig = Figure(figsize=(10, 6))
+        FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot()
+        # tight 저장을 쓰지 않으므로 여백을 미리 줄여 둠
+        self.fig.subplots_adjust(left=0.01, right=0.99, bottom=0.01, top=0.99)
+        self.layout = None
+        self.layout_digest = None
+        self.weights = None
+        self.relayouts = 0
+        self.recolors = 0
+
+    def update(self, theme_data):
+        sorted_data = sorted(theme_data.items(), key=lambda x: x[1], reverse=True)
+        labels = [item[0] for item in sorted_data]
+        values = [item[1] for item in sorted_data]
+        # 면적은 미리보기와 같은 규칙 (0 이하 값이 있으면 절댓값)
+        area = treemap_areas(values)
+        weights = area / area.sum() if len(area) else area
+
+        if (self.layout is None or labels != self.layout['labels']
+                or np.abs(weights - self.weights).max(initial=0) > self.relayout_threshold):
+            self._relayout(theme_data, labels, area)
+            self.weights = weights
+            return True
+
+        # 순위가 같으므로 기존 사각형/텍스트 객체를 그대로 두고 값만 바꿈
+        colors = compute_colors(values, self.custom_color_code)
+        for i, patch in enumerate(self.ax.patches):
+            patch.set_facecolor(colors[i])
+            self.ax.texts[2 * i + 1].set_text(f"{values[i]}%")
+        self.layout['values'] = values
+        self.layout['colors'] = colors
+        self.recolors += 1
+        return False
+
+    # 현재 화면을 PNG 로 인코딩
+    # 갱신마다 호출되므로 tight 자르기 없이 최소 압축으로 저장
+    def render_png(self, dpi=100):
+        return encode_figure(self.fig, dpi, compress_level=1, tight=False)
+
+    def _relayout(self, theme_data, labels, area):
+        self.ax.clear()
+        self.layout = prepare_treemap(theme_data, self.custom_color_code,
+                                      sizes=dict(zip(labels, area)))
+        draw_treemap(self.ax, self.layout, self.font_prop, self.theme_font_size,
+                     self.value_font_size, self.line_spacing)
+        # 사각형 배치 식별값: 같은 데이터라도 배치가 다르면 다른 이미지이므로 캐시 키에 사용
+        h = hashlib.blake2b(digest_size=16)
+        h.update('\x00'.join(map(str, self.layout['labels'])).encode('utf-8'))
+        h.update(self.layout['rects'].tobytes())
+        self.layout_digest = h.hexdigest()
+        self.relayouts += 1
+
+
+# 테스트용 시세 생성기: 매핑 파일의 종목으로 무작위 틱을 파일에 계속 추가
+def simulate_ticks(mapping, path, ticks_per_second=2000, duration=None):
+    prices = dict(zip(mapping['종목'].astype(str), mapping['기준가'].astype(float)))
+    tickers = list(prices)
+    start = time.time()
+    with open(path, 'a', encoding='utf-8') as f:
+        while duration is None or time.time() - start < duration:
+            batch_start = time.time()
+            lines = []
+            for ticker in random.choices(tickers, k=max(1, ticks_per_second // 10)):
+                prices[ticker] *= 1 + random.gauss(0, 0.001)
+                lines.append(f"{ticker},{prices[ticker]:.2f}\n")
+            f.write(''.join(lines))
+            f.flush()
+            time.sleep(max(0.0, 0.1 - (time.time() - batch_start)))
+
+
+# 매핑 파일 읽기 (.xlsx 또는 .csv)
+def load_mapping(path_or_file):
+    name = getattr(path_or_file, 'name', str(path_or_file))
+    # 종목코드 앞자리 0이 사라지지 않도록 문자열로 읽음
+    if name.endswith('.csv'):
+        return pd.read_csv(path_or_file, dtype={'종목': str})
+    return pd.read_excel(path_or_file, dtype={'종목': str})
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="테스트용 실시간 시세 파일 생성기")
+    parser.add_argument('mapping', help="'종목', '테마', '기준가' 컬럼을 가진 .xlsx/.csv 파일")
+    parser.add_argument('output', help="틱을 추가할 파일 (예: live_feeds/ticks.csv, 앱은 LIVE_FEED_DIR 안의 파일만 읽음)")
+    parser.add_argument('--rate', type=int, default=2000, help="초당 틱 수")
+    parser.add_argument('--duration', type=float, default=None, help="실행 시간(초), 생략하면 계속 실행")
+    args = parser.parse_args()
+    simulate_ticks(load_mapping(args.mapping), args.output, args.rate, args.duration)
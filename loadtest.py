@@ -0,0 +1,328 @@
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import requests
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.Common_pb2 import FileURLs, UploadedFileInfo
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+# Streamlit 앱(app.py) 동시 접속 부하 테스트
+# 로컬에 앱 서버를 띄우고, 브라우저 대신 웹소켓 클라이언트 N개가 동시에
+# 엑셀 업로드 -> 데이터 편집 -> 슬라이더 조작 -> 이미지 다운로드 순서로 사용하면서
+# 재실행(rerun) 지연시간 백분위수, 처리량, 서버 CPU/메모리를 측정함
+#
+# 사용법: python loadtest.py --sessions 20 --iterations 3
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+FONT_PATH = os.path.join(os.path.dirname(APP_PATH), 'chart', 'fonts', 'Pretendard-SemiBold.otf')
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+# 업로드용 엑셀 파일 (테마, 퍼센테이지)
+def make_excel(n_themes, seed):
+    rng = random.Random(seed)
+    df = pd.DataFrame({
+        "테마": [f"테마{i}" for i in range(n_themes)],
+        "퍼센테이지": [round(rng.uniform(0.5, 15.0), 2) for _ in range(n_themes)],
+    })
+    buf = io.BytesIO()
+    df.to_excel(buf, index=False)
+    return buf.getvalue()
+
+
+# 서버 프로세스의 누적 CPU 시간(초)과 현재 RSS(bytes) - /proc 기반 (Linux)
+def process_usage(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        with open(f"/proc/{pid}/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        return cpu, rss
+    except (OSError, IndexError, ValueError):
+        return None, None
+
+
+# 브라우저 한 개를 흉내내는 세션
+class AppSession:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.ws = None
+        self.session_id = None
+        self.widget_ids = {}
+        self.download_urls = {}
+        self.widgets = {}
+        self.latencies = {}
+        self.errors = 0
+
+    async def connect(self):
+        ws_url = self.base_url.replace('http', 'ws', 1) + "/_stcore/stream"
+        self.ws = await websockets.connect(ws_url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def _record(self, action, seconds):
+        self.latencies.setdefault(action, []).append(seconds)
+
+    def _read_delta(self, msg):
+        element = msg.delta.new_element
+        kind = element.WhichOneof('type')
+        if kind is None:
+            return
+        if kind == 'exception':
+            self.errors += 1
+            return
+        proto = getattr(element, kind)
+        widget_id = getattr(proto, 'id', '')
+        label = getattr(proto, 'label', '')
+        if widget_id:
+            # data_editor 는 라벨이 없으므로 위젯 키(editable_data)로 찾음
+            self.widget_ids[label or widget_id.rsplit('-', 1)[-1]] = widget_id
+        if kind == 'download_button':
+            self.download_urls[label] = proto.url
+
+    # 현재 위젯 상태로 스크립트를 재실행하고 끝날 때까지 기다림
+    async def rerun(self, action):
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.widget_states.widgets.extend(self.widgets.values())
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            fmsg = ForwardMsg.FromString(await self.ws.recv())
+            kind = fmsg.WhichOneof('type')
+            if kind == 'new_session':
+                self.session_id = fmsg.new_session.initialize.session_id
+            elif kind == 'delta' and fmsg.delta.WhichOneof('type') == 'new_element':
+                self._read_delta(fmsg)
+            elif kind == 'script_finished':
+                if fmsg.script_finished != ForwardMsg.FINISHED_SUCCESSFULLY:
+                    self.errors += 1
+                break
+        self._record(action, time.perf_counter() - start)
+
+    def _set_widget(self, label, **value):
+        state = WidgetState(id=self.widget_ids[label], **value)
+        self.widgets[label] = state
+
+    async def upload_excel(self, name, content):
+        request_id = uuid.uuid4().hex
+        msg = BackMsg()
+        msg.file_urls_request.request_id = request_id
+        msg.file_urls_request.file_names.append(name)
+        msg.file_urls_request.session_id = self.session_id
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            fmsg = ForwardMsg.FromString(await self.ws.recv())
+            if (fmsg.WhichOneof('type') == 'file_urls_response'
+                    and fmsg.file_urls_response.response_id == request_id):
+                urls = fmsg.file_urls_response.file_urls[0]
+                break
+        response = await asyncio.to_thread(
+            requests.put, self.base_url + urls.upload_url,
+            files={'file': (name, content, XLSX_MIME)}, timeout=60
+        )
+        if response.status_code != 204 and response.status_code != 200:
+            self.errors += 1
+        self._record('업로드(HTTP)', time.perf_counter() - start)
+
+        info = UploadedFileInfo(
+            file_id=urls.file_id, name=name, size=len(content),
+            file_urls=FileURLs(file_id=urls.file_id, upload_url=urls.upload_url,
+                               delete_url=urls.delete_url)
+        )
+        state = WidgetState(id=self.widget_ids["엑셀 파일을 업로드하세요 (.xlsx)"])
+        state.file_uploader_state_value.uploaded_file_info.append(info)
+        self.widgets["엑셀 파일을 업로드하세요 (.xlsx)"] = state
+        await self.rerun('업로드 반영')
+
+    async def edit_row(self, row, value):
+        edits = {"edited_rows": {str(row): {"상승률(%)": value}}, "added_rows": [], "deleted_rows": []}
+        self._set_widget('editable_data', string_value=json.dumps(edits))
+        await self.rerun('데이터 편집')
+
+    async def drag_slider(self, label, value):
+        state = WidgetState(id=self.widget_ids[label])
+        state.double_array_value.data.append(value)
+        self.widgets[label] = state
+        await self.rerun('슬라이더')
+
+    async def download(self):
+        url = self.download_urls.get("트리맵 이미지 다운로드")
+        if url is None:
+            self.errors += 1
+            return
+        start = time.perf_counter()
+        response = await asyncio.to_thread(requests.get, self.base_url + url, timeout=60)
+        if response.status_code != 200:
+            self.errors += 1
+        self._record('다운로드(HTTP)', time.perf_counter() - start)
+
+
+# 세션 하나의 사용 시나리오
+async def run_script(base_url, index, iterations, excel, think_time):
+    session = AppSession(base_url)
+    rng = random.Random(index)
+    try:
+        await session.connect()
+        await session.rerun('첫 접속')
+        await session.upload_excel(f"themes_{index}.xlsx", excel)
+        for _ in range(iterations):
+            await session.edit_row(rng.randrange(5), round(rng.uniform(0.5, 20.0), 2))
+            await asyncio.sleep(rng.uniform(0, think_time))
+            await session.drag_slider("테마명 폰트 크기", float(rng.randint(12, 26)))
+            await session.drag_slider("상승률 폰트 크기", float(rng.randint(12, 26)))
+            await asyncio.sleep(rng.uniform(0, think_time))
+            await session.download()
+    except Exception as e:
+        print(f"세션 {index} 오류: {e}", file=sys.stderr)
+        session.errors += 1
+    finally:
+        await session.close()
+    return session
+
+
+# 부하 테스트 동안 서버 CPU/메모리 샘플링
+async def sample_usage(pid, samples, interval=0.5):
+    while True:
+        samples.append((time.perf_counter(), *process_usage(pid)))
+        await asyncio.sleep(interval)
+
+
+async def run_load(base_url, pid, sessions, iterations, themes, distinct_data, think_time):
+    shared_excel = make_excel(themes, 0)
+    samples = []
+    sampler = asyncio.create_task(sample_usage(pid, samples)) if pid else None
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        run_script(base_url, i, iterations,
+                   make_excel(themes, i) if distinct_data else shared_excel, think_time)
+        for i in range(sessions)
+    ])
+    wall = time.perf_counter() - start
+    if sampler is not None:
+        samples.append((time.perf_counter(), *process_usage(pid)))
+        sampler.cancel()
+    return results, wall, samples
+
+
+def summarize(results, wall, samples):
+    by_action = {}
+    for session in results:
+        for action, values in session.latencies.items():
+            by_action.setdefault(action, []).extend(values)
+    all_reruns = [v for action, values in by_action.items() if 'HTTP' not in action for v in values]
+    rows = []
+    for action, values in list(by_action.items()) + [('전체 재실행', all_reruns)]:
+        # 서버에 연결하지 못했거나 첫 재실행 전에 실패한 경우 기록이 없으므로 건너뜀 (오류 수로 확인)
+        if not values:
+            continue
+        arr = np.asarray(values) * 1000
+        rows.append({
+            '동작': action, '횟수': len(arr),
+            'p50(ms)': np.percentile(arr, 50), 'p95(ms)': np.percentile(arr, 95),
+            'p99(ms)': np.percentile(arr, 99), '최대(ms)': arr.max(),
+        })
+    table = pd.DataFrame(rows, columns=['동작', '횟수', 'p50(ms)', 'p95(ms)', 'p99(ms)', '최대(ms)']).round(1)
+    reruns = len(all_reruns)
+    summary = {
+        '세션 수': len(results),
+        '오류 수': sum(session.errors for session in results),
+        '소요 시간(s)': round(wall, 2),
+        '처리량(재실행/s)': round(reruns / wall, 2),
+    }
+    usage = [(t, cpu, rss) for t, cpu, rss in samples if cpu is not None]
+    if len(usage) >= 2:
+        summary['서버 평균 CPU(%)'] = round(
+            (usage[-1][1] - usage[0][1]) / (usage[-1][0] - usage[0][0]) * 100, 1
+        )
+        summary['서버 RSS 시작(MB)'] = round(usage[0][2] / 2 ** 20, 1)
+        summary['서버 RSS 최대(MB)'] = round(max(rss for _, _, rss in usage) / 2 ** 20, 1)
+    return table, summary
+
+
+# 로컬 앱 서버 실행 (임시 작업 폴더에서 실행해 폰트/이력 파일이 저장소에 남지 않게 함)
+def start_server(port, workdir):
+    # 앱이 재실행마다 폰트 다운로드를 시도하지 않도록 저장소의 폰트를 미리 복사
+    os.makedirs(os.path.join(workdir, 'fonts'), exist_ok=True)
+    shutil.copy(FONT_PATH, os.path.join(workdir, 'fonts'))
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', APP_PATH,
+         '--server.headless', 'true', '--server.port', str(port),
+         '--server.enableXsrfProtection', 'false', '--server.enableCORS', 'false',
+         '--server.fileWatcherType', 'none', '--browser.gatherUsageStats', 'false'],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://localhost:{port}"
+    for _ in range(120):
+        try:
+            if requests.get(base_url + "/_stcore/health", timeout=1).status_code == 200:
+                return process, base_url
+        except requests.ConnectionError:
+            pass
+        if process.poll() is not None:
+            break
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("Streamlit 서버를 시작하지 못했습니다.")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="트리맵 앱 동시 접속 부하 테스트")
+    parser.add_argument('--sessions', type=int, default=10, help="동시 세션 수")
+    parser.add_argument('--iterations', type=int, default=3, help="세션당 편집/슬라이더/다운로드 반복 횟수")
+    parser.add_argument('--themes', type=int, default=30, help="업로드 엑셀의 테마 수")
+    parser.add_argument('--distinct-data', action='store_true', help="세션마다 다른 데이터를 업로드")
+    parser.add_argument('--think-time', type=float, default=0.5, help="동작 사이 최대 대기 시간(초)")
+    parser.add_argument('--url', help="이미 실행 중인 서버 주소 (생략하면 로컬 서버를 직접 실행)")
+    parser.add_argument('--pid', type=int, help="--url 사용 시 CPU/메모리를 측정할 서버 프로세스 ID")
+    parser.add_argument('--port', type=int, default=8599)
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        base_url, pid = args.url, args.pid
+    else:
+        workdir = tempfile.mkdtemp(prefix="treemap_loadtest_")
+        server, base_url = start_server(args.port, workdir)
+        pid = server.pid
+    try:
+        results, wall, samples = asyncio.run(run_load(
+            base_url, pid, args.sessions, args.iterations, args.themes,
+            args.distinct_data, args.think_time
+        ))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    table, summary = summarize(results, wall, samples)
+    if table.empty:
+        print("기록된 지연시간이 없습니다. 서버 주소와 세션 오류 메시지를 확인하세요.")
+    else:
+        print(table.to_string(index=False))
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'latency': table.to_dict(orient='records')},
+                      f, ensure_ascii=False, indent=2)
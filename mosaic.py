@@ -0,0 +1,88 @@
+import argparse
+import math
+
+import pandas as pd
+from matplotlib.figure import Figure
+
+from treemap_render import prepare_treemap, draw_treemap, decorate_figure, font_options
+
+
+# 상승률 상위/하위 N개 테마
+def top_movers(theme_data, n, gainers=True):
+    ranked = sorted(theme_data.items(), key=lambda x: x[1], reverse=gainers)
+    return dict(ranked[:n])
+
+
+# '섹터' 컬럼 기준으로 섹터별 {테마: 상승률} 나누기
+def split_by_sector(df):
+    return [
+        (str(sector), dict(zip(group["테마"], group["퍼센테이지"])))
+        for sector, group in df.dropna(subset=["테마", "퍼센테이지"]).groupby("섹터", sort=False)
+    ]
+
+
+# 모든 패널의 레이아웃/색상을 미리 계산
+# 면적 규칙은 미리보기와 같으므로(treemap_areas) 같은 데이터는 같은 배치가 됨.
+# 패널당 수 ms 의 순수 파이썬 계산이라 스레드로는 GIL 때문에 빨라지지 않아 순서대로 처리
+def prepare_panels(panels, custom_color_code):
+    return [prepare_treemap(data, custom_color_code) for _, data in panels]
+
+
+# 여러 트리맵을 하나의 Figure 에 격자로 배치
+# panels: [(패널 제목, {테마: 상승률}), ...]
+# 폰트 설정과 저장(savefig)은 전체에 대해 한 번만 수행
+def render_mosaic(panels, custom_color_code, font_prop=None, cols=2, panel_size=(10, 6),
+                  theme_font_size=22, value_font_size=22, line_spacing=0.04, title_text="",
+                  watermark_enabled=False, watermark_text="", watermark_opacity=0.3,
+                  watermark_size=85):
+    panels = [(title, data) for title, data in panels if data]
+    if not panels:
+        raise ValueError("모자이크에 넣을 데이터가 없습니다.")
+    layouts = prepare_panels(panels, custom_color_code)
+
+    cols = max(1, min(cols, len(panels)))
+    rows = math.ceil(len(panels) / cols)
+    fig = Figure(figsize=(panel_size[0] * cols, panel_size[1] * rows))
+    axes = fig.subplots(rows, cols, squeeze=False).ravel()
+    for ax, (title, _), layout in zip(axes, panels, layouts):
+        draw_treemap(ax, layout, font_prop, theme_font_size, value_font_size, line_spacing)
+        ax.set_title(title, **font_options(font_prop), fontsize=18)
+    for ax in axes[len(panels):]:
+        ax.axis('off')
+
+    decorate_figure(fig, font_prop, title_text, watermark_enabled, watermark_text,
+                    watermark_opacity, watermark_size)
+    return fig
+
+
+# 아침 리포트용 기본 패널 구성: 전체 테마, 섹터별, 상승/하락 상위 N
+def report_panels(df, top_n=10):
+    theme_data = dict(zip(df["테마"], df["퍼센테이지"]))
+    panels = [("전체 테마", theme_data)]
+    if "섹터" in df.columns:
+        panels.extend(split_by_sector(df))
+    panels.append((f"상승 상위 {top_n}", top_movers(theme_data, top_n, gainers=True)))
+    panels.append((f"하락 상위 {top_n}", top_movers(theme_data, top_n, gainers=False)))
+    return panels
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="여러 트리맵을 한 장의 이미지로 내보내기")
+    parser.add_argument('excel', help="'테마', '퍼센테이지' (선택: '섹터') 컬럼을 가진 엑셀 파일")
+    parser.add_argument('output', help="저장할 이미지 파일 (예: report.png)")
+    parser.add_argument('--cols', type=int, default=3)
+    parser.add_argument('--top', type=int, default=10, help="상승/하락 상위 패널의 테마 수")
+    parser.add_argument('--dpi', type=int, default=150)
+    parser.add_argument('--color', default="#FF0000", help="내부 색상 코드")
+    parser.add_argument('--font', help="폰트 파일 경로 (예: chart/fonts/Pretendard-SemiBold.otf)")
+    args = parser.parse_args()
+
+    font_prop = None
+    if args.font:
+        import matplotlib.font_manager as fm
+        fm.fontManager.addfont(args.font)
+        font_prop = fm.FontProperties(fname=args.font)
+
+    fig = render_mosaic(report_panels(pd.read_excel(args.excel), args.top), args.color,
+                        font_prop=font_prop, cols=args.cols)
+    fig.savefig(args.output, dpi=args.dpi, bbox_inches='tight')
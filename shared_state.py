@@ -0,0 +1,226 @@
+import hashlib
+import sys
+import threading
+import types
+import weakref
+from collections import OrderedDict
+from collections.abc import ItemsView, Mapping, ValuesView
+
+import numpy as np
+import pandas as pd
+from matplotlib.artist import Artist
+
+
+# 읽기 전용 테마 데이터 {테마: 상승률}
+# 테마 이름은 intern 된 문자열 튜플, 상승률은 NumPy 배열로 저장하며 절대 수정하지 않음.
+# 값을 바꿀 때는 새 데이터셋을 만들어(copy-on-write) 풀에 다시 등록함
+class ThemeDataset(Mapping):
+    __slots__ = ('themes', 'percentages', 'digest', '_frame', '__weakref__')
+
+    def __init__(self, themes, values):
+        self.themes = tuple(sys.intern(str(theme)) for theme in themes)
+        self.percentages = np.asarray(values, dtype=np.float64).copy()
+        self.percentages.setflags(write=False)
+        h = hashlib.blake2b(digest_size=16)
+        h.update('\x00'.join(self.themes).encode('utf-8'))
+        h.update(self.percentages.tobytes())
+        self.digest = h.hexdigest()
+        self._frame = None
+
+    @classmethod
+    def from_dict(cls, theme_data):
+        return cls(list(theme_data.keys()), [float(v) for v in theme_data.values()])
+
+    def __getitem__(self, theme):
+        try:
+            return float(self.percentages[self.themes.index(theme)])
+        except ValueError:
+            raise KeyError(theme) from None
+
+    def __iter__(self):
+        return iter(self.themes)
+
+    def __len__(self):
+        return len(self.themes)
+
+    # Mapping 기본 뷰는 값마다 __getitem__(테마 검색)을 거치므로 배열을 바로 순회하는 뷰로 대체
+    def items(self):
+        return _DatasetItems(self)
+
+    def values(self):
+        return _DatasetValues(self)
+
+    # 한 테마를 추가/수정한 새 데이터 (원본은 그대로)
+    def with_item(self, theme, value):
+        data = dict(self.items())
+        data[theme] = value
+        return data
+
+    # data_editor 에 넘길 DataFrame: 데이터셋마다 한 번만 만들어 모든 세션이 공유
+    def frame(self):
+        if self._frame is None:
+            self._frame = pd.DataFrame({'테마': list(self.themes), '상승률(%)': self.percentages.tolist()})
+        return self._frame
+
+
+class _DatasetItems(ItemsView):
+    def __iter__(self):
+        return zip(self._mapping.themes, self._mapping.percentages.tolist())
+
+
+class _DatasetValues(ValuesView):
+    def __iter__(self):
+        return iter(self._mapping.percentages.tolist())
+
+
+# 프로세스 전체에서 공유하는 데이터셋 풀과 렌더링 결과 캐시
+# 크기 합계는 추가/삭제 시점에 갱신해 두므로 stats() 는 잠금 안에서 다시 계산하지 않음
+class SharedPool:
+    def __init__(self, max_render_bytes=256 * 1024 * 1024):
+        # 데이터셋 해제 콜백이 잠금을 잡고 있는 스레드 안에서 실행될 수 있으므로 RLock 사용
+        self.lock = threading.RLock()
+        # 어떤 세션도 참조하지 않는 데이터셋은 자동으로 사라짐
+        self.datasets = weakref.WeakValueDictionary()
+        # id(데이터셋) -> 크기(bytes), 데이터셋이 해제되면 finalize 콜백에서 제거
+        self.dataset_sizes = {}
+        self.dataset_bytes = 0
+        self.renders = OrderedDict()
+        # 캐시에 있는 바이트 객체의 id -> 참조하는 항목 수 (is_shared 를 순회 없이 확인)
+        self.render_ids = {}
+        self.render_bytes = 0
+        self.max_render_bytes = max_render_bytes
+        self.render_hits = 0
+        self.render_misses = 0
+
+    # dict 또는 ThemeDataset 을 받아 같은 내용의 공유 데이터셋을 돌려줌
+    def dataset(self, theme_data):
+        if not isinstance(theme_data, ThemeDataset):
+            theme_data = ThemeDataset.from_dict(theme_data)
+        with self.lock:
+            shared = self.datasets.get(theme_data.digest)
+            if shared is None:
+                self.datasets[theme_data.digest] = shared = theme_data
+                self._add_dataset_bytes(shared, deep_sizeof(shared))
+                weakref.finalize(shared, self._forget_dataset, id(shared)).atexit = False
+            return shared
+
+    # data_editor 에 넘길 DataFrame (데이터셋마다 한 번만 만들고 크기를 합계에 반영)
+    def frame(self, dataset):
+        with self.lock:
+            if dataset._frame is None:
+                self._add_dataset_bytes(dataset, deep_sizeof(dataset.frame()))
+            return dataset._frame
+
+    def _add_dataset_bytes(self, dataset, size):
+        key = id(dataset)
+        if key in self.dataset_sizes or self.datasets.get(dataset.digest) is dataset:
+            self.dataset_sizes[key] = self.dataset_sizes.get(key, 0) + size
+            self.dataset_bytes += size
+
+    def _forget_dataset(self, key):
+        with self.lock:
+            self.dataset_bytes -= self.dataset_sizes.pop(key, 0)
+
+    # (데이터셋, 렌더링 옵션) 별 이미지 바이트. 없으면 render() 로 만들고 LRU 로 보관
+    def rendered(self, key, render):
+        with self.lock:
+            data = self.renders.get(key)
+            if data is not None:
+                self.renders.move_to_end(key)
+                self.render_hits += 1
+                return data
+        data = render()
+        with self.lock:
+            self.render_misses += 1
+            if key in self.renders:
+                # 다른 세션이 먼저 만들어 둔 경우 그 바이트를 공유
+                return self.renders[key]
+            self.renders[key] = data
+            self.render_ids[id(data)] = self.render_ids.get(id(data), 0) + 1
+            self.render_bytes += len(data)
+            while self.render_bytes > self.max_render_bytes and len(self.renders) > 1:
+                _, old = self.renders.popitem(last=False)
+                self.render_bytes -= len(old)
+                if self.render_ids[id(old)] == 1:
+                    del self.render_ids[id(old)]
+                else:
+                    self.render_ids[id(old)] -= 1
+        return data
+
+    # 캐시에 있으면 바이트, 없으면 None (새로 만들지 않음)
+    def cached(self, key):
+        with self.lock:
+            data = self.renders.get(key)
+            if data is not None:
+                self.renders.move_to_end(key)
+            return data
+
+    def is_shared(self, obj):
+        with self.lock:
+            if isinstance(obj, ThemeDataset):
+                return self.datasets.get(obj.digest) is obj
+            if isinstance(obj, bytes):
+                # 캐시에 들어 있는 객체는 살아 있으므로 id 가 같으면 같은 객체
+                return id(obj) in self.render_ids
+            return False
+
+    def stats(self):
+        with self.lock:
+            return {
+                '공유 데이터셋 수': len(self.datasets),
+                '공유 데이터셋 크기(bytes)': self.dataset_bytes,
+                '렌더링 캐시 항목 수': len(self.renders),
+                '렌더링 캐시 크기(bytes)': self.render_bytes,
+                '렌더링 캐시 적중/실패': f"{self.render_hits}/{self.render_misses}",
+            }
+
+
+# 객체가 차지하는 메모리(대략, 중복 참조는 한 번만 계산)
+# 일반 파이썬 객체(실시간 집계기 등)는 속성을 따라가며 계산함.
+# Figure 같은 matplotlib 객체는 내부 렌더러/캐시 크기를 알 수 없으므로 0으로 두고 unmeasured 에 타입 이름을 기록
+def deep_sizeof(obj, seen=None, unmeasured=None):
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, Artist):
+        if unmeasured is not None:
+            unmeasured.add(type(obj).__name__)
+        return 0
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is None else 0)
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(np.sum(obj.memory_usage(deep=True)))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, ThemeDataset):
+        size += deep_sizeof(obj.themes, seen, unmeasured) + deep_sizeof(obj.percentages, seen, unmeasured)
+        if obj._frame is not None:
+            size += deep_sizeof(obj._frame, seen, unmeasured)
+    elif isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen, unmeasured) + deep_sizeof(v, seen, unmeasured) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen, unmeasured) for item in obj)
+    elif not isinstance(obj, (type, types.ModuleType)) and isinstance(getattr(obj, '__dict__', None), dict):
+        size += deep_sizeof(obj.__dict__, seen, unmeasured)
+    return size
+
+
+# 세션 상태의 항목별 메모리 사용량
+# 공유 풀에 있는 객체는 '공유' 로 표시하고 세션 고유 사용량에서 제외
+# '측정 제외' 에는 크기에 포함하지 못한 객체(Figure 등)를 표시
+def session_memory_report(session_state, pool):
+    rows = []
+    for key in sorted(session_state.keys(), key=str):
+        value = session_state[key]
+        unmeasured = set()
+        rows.append({
+            '항목': str(key),
+            '타입': type(value).__name__,
+            '크기(bytes)': deep_sizeof(value, unmeasured=unmeasured),
+            '공유': pool.is_shared(value),
+            '측정 제외': ', '.join(sorted(unmeasured)),
+        })
+    report = pd.DataFrame(rows, columns=['항목', '타입', '크기(bytes)', '공유', '측정 제외'])
+    own_bytes = int(report.loc[~report['공유'], '크기(bytes)'].sum()) if len(report) else 0
+    return report, own_bytes
@@ -0,0 +1,132 @@
+import numpy as np
+import squarify
+import matplotlib.patches as patches
+from matplotlib.colors import to_rgb, to_hex
+
+
+# 폰트 객체가 있으면 fontproperties 옵션을 붙여주는 헬퍼
+def font_options(font_prop):
+    if font_prop is not None:
+        return {'fontproperties': font_prop}
+    return {}
+
+
+# 상승률 목록으로 사각형 색상 계산
+def compute_colors(values, custom_color_code):
+    max_val = max(values) if values else 1
+    min_val = min(values) if values else 0
+    normalized_values = [
+        (val - min_val) / (max_val - min_val) if max_val > min_val else 0.5
+        for val in values
+    ]
+
+    # 내부 색상 지정:
+    # 사용자가 입력한 내부 색상 코드(custom_color_code)를 기본으로 하여,
+    # 최고 상승률 (n=1)은 원래 색상, 낮은 값 (n=0)은 초록 성분을 증가시켜 주황색에 가까워지도록.
+    # 여기서는 R와 B는 그대로 두고, G 값을 base_G + (target - base_G) * (1 - n) 로 계산합니다.
+    base_rgb = to_rgb(custom_color_code)
+    target_green = 0.5  # 목표 G 값 (최저값에 해당)
+    colors = []
+    for n in normalized_values:
+        # n=1 -> G = base_rgb[1], n=0 -> G = target_green
+        new_green = base_rgb[1] + (target_green - base_rgb[1]) * (1 - n)
+        colors.append(to_hex((base_rgb[0], new_green, base_rgb[2])))
+    return colors
+
+
+# 상승률로 사각형 면적 계산 (미리보기, 모자이크, 실시간 화면 공통 규칙)
+# 모두 양수면 상승률 그대로, 0 이하 값이 섞여 있으면 절댓값(최소 0.01)을 면적으로 사용
+def treemap_areas(values):
+    values = np.asarray(values, dtype=float)
+    if len(values) and values.min() <= 0:
+        return np.maximum(np.abs(values), 0.01)
+    return values
+
+
+# 트리맵 레이아웃/색상 계산 (그리기와 분리해서 미리보기, 딥줌 등에서 공통으로 사용)
+# theme_data: {테마: 상승률}, sizes: {테마: 면적} (없으면 treemap_areas 규칙으로 계산)
+def prepare_treemap(theme_data, custom_color_code, sizes=None):
+    # 상승률 기준 내림차순 정렬
+    sorted_data = sorted(theme_data.items(), key=lambda x: x[1], reverse=True)
+    labels = [item[0] for item in sorted_data]
+    values = [item[1] for item in sorted_data]
+    if sizes is None:
+        area = treemap_areas(values)
+    else:
+        area = np.asarray([sizes.get(label, 0.0) for label in labels], dtype=float)
+
+    colors = compute_colors(values, custom_color_code)
+
+    rects = np.zeros((len(values), 4))
+    if values:
+        norm_sizes = area / area.sum()
+        for i, rect in enumerate(squarify.squarify(list(norm_sizes), 0, 0, 1, 1)):
+            rects[i] = (rect['x'], rect['y'], rect['dx'], rect['dy'])
+
+    return {
+        'labels': labels,
+        'values': values,
+        'colors': colors,
+        # 각 행: (x, y, dx, dy) - 단위 정사각형(0~1) 좌표
+        'rects': rects,
+    }
+
+
+# 준비된 레이아웃을 축(ax)에 그리기
+def draw_treemap(ax, layout, font_prop, theme_font_size, value_font_size, line_spacing):
+    labels, values, colors = layout['labels'], layout['values'], layout['colors']
+    for i, (x, y, dx, dy) in enumerate(layout['rects']):
+        ax.add_patch(
+            patches.Rectangle(
+                (x, y), dx, dy,
+                facecolor=colors[i],
+                edgecolor='white',
+                linewidth=2,
+                alpha=0.8
+            )
+        )
+        ax.text(
+            x + dx / 2,
+            y + dy / 2 - line_spacing,
+            f"{labels[i]}",
+            horizontalalignment='center',
+            verticalalignment='center',
+            fontsize=theme_font_size,
+            fontweight='bold',
+            color='white',
+            **font_options(font_prop)
+        )
+        ax.text(
+            x + dx / 2,
+            y + dy / 2 + line_spacing,
+            f"{values[i]}%",
+            horizontalalignment='center',
+            verticalalignment='center',
+            fontsize=value_font_size,
+            fontweight='bold',
+            color='white',
+            **font_options(font_prop)
+        )
+
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.axis('off')
+
+
+# 워터마크 및 제목 추가
+def decorate_figure(fig, font_prop, title_text, watermark_enabled, watermark_text,
+                    watermark_opacity, watermark_size):
+    if watermark_enabled:
+        fig.text(
+            0.5, 0.5, watermark_text,
+            fontsize=watermark_size,
+            color='white',
+            ha='center',
+            va='center',
+            alpha=watermark_opacity,
+            fontweight='bold',
+            rotation=0,
+            **font_options(font_prop)
+        )
+    if title_text:  # 제목이 있을 때만 표시
+        fig.suptitle(title_text, fontsize=18, **font_options(font_prop))